@@ -121,7 +121,7 @@ class CatArrayEncoder(ArrayEncoder):
 
     def decode(self, data: torch.Tensor) -> List[Iterable]:
         data = torch.round(data)  # improves accuracy as by default ordinal encoder will truncate
-        decoded = self._normalizer.decode(data.reshape(-1, 1).tolist()).reshape(1, -1)
+        decoded = self._normalizer.decode(data.reshape(-1, 1).tolist()).reshape(data.shape)  # one row per input
         return decoded
 
 
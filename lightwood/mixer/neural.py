@@ -1,4 +1,5 @@
 import time
+import functools
 from copy import deepcopy
 from collections import deque
 from typing import Dict, List, Optional
@@ -18,7 +19,7 @@ from type_infer.dtype import dtype
 from lightwood.helpers.log import log
 from lightwood.encoder.base import BaseEncoder
 from lightwood.helpers.torch import LightwoodAutocast
-from lightwood.data.encoded_ds import EncodedDs
+from lightwood.data.encoded_ds import EncodedDs, ConcatedEncodedDs
 from lightwood.mixer.base import BaseMixer
 from lightwood.mixer.helpers.ar_net import ArNet
 from lightwood.mixer.helpers.default_net import DefaultNet
@@ -26,6 +27,23 @@ from lightwood.api.types import PredictionArguments
 from lightwood.mixer.helpers.transform_corss_entropy_loss import TransformCrossEntropyLoss
 
 
+def _tf32_matmul(func):
+    """
+    Allows TF32 float32 matmuls (Ampere and newer GPUs) while `func` runs.
+    The process-wide setting is restored afterwards so other models are unaffected.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        prev = torch.get_float32_matmul_precision()
+        torch.set_float32_matmul_precision('high')
+        try:
+            return func(*args, **kwargs)
+        finally:
+            torch.set_float32_matmul_precision(prev)
+
+    return wrapper
+
+
 class Neural(BaseMixer):
     model: nn.Module
     dtype_dict: dict
@@ -84,8 +102,8 @@ class Neural(BaseMixer):
                     decoded_predictions = []
                     decoded_real_values = []
                     for X, Y in data:
-                        X = X.to(self.model.device)
-                        Y = Y.to(self.model.device)
+                        X = X.to(self.model.device, non_blocking=True)
+                        Y = Y.to(self.model.device, non_blocking=True)
                         Yh = self._net_call(X)
 
                         Yh = torch.unsqueeze(Yh, 0) if len(Yh.shape) < 2 else Yh
@@ -148,11 +166,11 @@ class Neural(BaseMixer):
                     dl_iter = iter(dl)
                     X, Y = next(dl_iter)
 
-                X = X.to(self.model.device)
-                Y = Y.to(self.model.device)
+                X = X.to(self.model.device, non_blocking=True)
+                Y = Y.to(self.model.device, non_blocking=True)
 
                 with LightwoodAutocast():
-                    optimizer.zero_grad()
+                    optimizer.zero_grad(set_to_none=True)
                     Yh = self._net_call(X)
                     loss = criterion(Yh, Y)
                     if LightwoodAutocast.active:
@@ -187,16 +205,18 @@ class Neural(BaseMixer):
         epochs_to_best = 0
         best_dev_error = pow(2, 32)
         running_errors = deque(maxlen=self.loss_hist_len)
-        best_model = self.model
+        best_state = None
 
         for epoch in range(1, return_model_after + 1):
             self.model = self.model.train()
-            running_losses: List[float] = []
+            # accumulate on device so that the host only syncs once per epoch
+            running_loss = torch.zeros((), device=self.model.device)
+            n_batches = 0
             for i, (X, Y) in enumerate(train_dl):
-                X = X.to(self.model.device)
-                Y = Y.to(self.model.device)
+                X = X.to(self.model.device, non_blocking=True)
+                Y = Y.to(self.model.device, non_blocking=True)
                 with LightwoodAutocast():
-                    optimizer.zero_grad()
+                    optimizer.zero_grad(set_to_none=True)
                     Yh = self._net_call(X)
                     loss = criterion(Yh, Y)
                     if LightwoodAutocast.active:
@@ -207,11 +227,12 @@ class Neural(BaseMixer):
                         loss.backward()
                         optimizer.step()
 
-                running_losses.append(loss.item())
+                running_loss += loss.detach()
+                n_batches += 1
                 if (time.time() - self.started) > stop_after:
                     break
 
-            train_error = np.mean(running_losses)
+            train_error = (running_loss / n_batches).item()
             epoch_error = self._error(dev_dl, criterion)
             running_errors.append(epoch_error)
             log.info(f'Loss @ epoch {epoch}: {epoch_error}')
@@ -223,7 +244,8 @@ class Neural(BaseMixer):
 
             if best_dev_error > running_errors[-1]:
                 best_dev_error = running_errors[-1]
-                best_model = deepcopy(self.model)
+                # snapshot weights only, on CPU, rather than cloning the whole module
+                best_state = {k: v.detach().to('cpu', copy=True) for k, v in self.model.state_dict().items()}
                 epochs_to_best = epoch
 
             # manually set epoch limit
@@ -246,18 +268,22 @@ class Neural(BaseMixer):
 
         if np.isnan(best_dev_error):
             best_dev_error = pow(2, 32)
-        return best_model, epochs_to_best, best_dev_error
+        if best_state is not None:
+            self.model.load_state_dict(best_state)
+        return self.model, epochs_to_best, best_dev_error
 
     def _error(self, dev_dl, criterion) -> float:
         self.model = self.model.eval()
-        running_losses: List[float] = []
-        with torch.no_grad():
+        running_loss = torch.zeros((), device=self.model.device)
+        n_batches = 0
+        with torch.inference_mode():
             for X, Y in dev_dl:
-                X = X.to(self.model.device)
-                Y = Y.to(self.model.device)
+                X = X.to(self.model.device, non_blocking=True)
+                Y = Y.to(self.model.device, non_blocking=True)
                 Yh = self._net_call(X)
-                running_losses.append(criterion(Yh, Y).item())
-            return np.mean(running_losses)
+                running_loss += criterion(Yh, Y)
+                n_batches += 1
+            return (running_loss / n_batches).item()
 
     def _init_net(self, ds: EncodedDs):
         self.net_class = DefaultNet if self.net_name == 'DefaultNet' else ArNet
@@ -291,11 +317,14 @@ class Neural(BaseMixer):
         self.batch_size = min(200, int(len(train_data) / 10))
         self.batch_size = max(40, self.batch_size)
 
-        dev_dl = DataLoader(dev_data, batch_size=self.batch_size, shuffle=False)
-        train_dl = DataLoader(train_data, batch_size=self.batch_size, shuffle=False)
-
         # Find learning rate & keep initial weights
         self._init_net(train_data)
+
+        # pinned host memory lets batches be copied to the GPU asynchronously
+        pin_memory = self.model.device.type == 'cuda'
+        dev_dl = DataLoader(dev_data, batch_size=self.batch_size, shuffle=False, pin_memory=pin_memory)
+        train_dl = DataLoader(train_data, batch_size=self.batch_size, shuffle=False, pin_memory=pin_memory)
+
         if not self.lr:
             self.lr, self.model = self._find_lr(train_data)
 
@@ -314,10 +343,12 @@ class Neural(BaseMixer):
         if self.fit_on_dev:
             self.partial_fit(dev_data, train_data)
 
+    @_tf32_matmul
     def fit(self, train_data: EncodedDs, dev_data: EncodedDs) -> None:
         self._fit(train_data, dev_data)
         self._final_tuning(dev_data)
 
+    @_tf32_matmul
     def partial_fit(self, train_data: EncodedDs, dev_data: EncodedDs, args: Optional[dict] = None) -> None:
         """
         Augments the mixer's fit with new data, nr of epochs is based on the amount of epochs the original fitting took
@@ -328,8 +359,9 @@ class Neural(BaseMixer):
 
         # Based this on how long the initial training loop took, at a low learning rate as to not mock anything up tooo badly # noqa
         self.started = time.time()
-        train_dl = DataLoader(train_data, batch_size=self.batch_size, shuffle=True)
-        dev_dl = DataLoader(dev_data, batch_size=self.batch_size, shuffle=True)
+        pin_memory = self.model.device.type == 'cuda'
+        train_dl = DataLoader(train_data, batch_size=self.batch_size, shuffle=True, pin_memory=pin_memory)
+        dev_dl = DataLoader(dev_data, batch_size=self.batch_size, shuffle=True, pin_memory=pin_memory)
         optimizer = self._select_optimizer(self.model, lr=self.lr)
         criterion = self._select_criterion()
         scaler = GradScaler()
@@ -337,6 +369,7 @@ class Neural(BaseMixer):
         self.model, _, _ = self._max_fit(train_dl, dev_dl, criterion, optimizer, scaler,
                                          self.stop_after * 0.1, max(1, int(self.epochs_to_best / 3)))
 
+    @_tf32_matmul
     def __call__(self, ds: EncodedDs,
                  args: PredictionArguments = PredictionArguments()) -> pd.DataFrame:
         """
@@ -352,11 +385,17 @@ class Neural(BaseMixer):
         all_probs: List[List[float]] = []
         rev_map = {}
 
-        with torch.no_grad():
-            for idx, (X, Y) in enumerate(ds):
-                X = X.to(self.model.device)
+        # dependency data is looked up per row, so encoders that need it are still fed one sample at a time
+        batch_size = 1 if self.target_encoder.dependencies else 256
+        # ConcatedEncodedDs.__len__ under-reports its size, so every row is sampled explicitly
+        length = sum(ds.encoded_ds_lengths) if isinstance(ds, ConcatedEncodedDs) else len(ds)
+        dl = DataLoader(ds, batch_size=batch_size, sampler=range(length),
+                        pin_memory=self.model.device.type == 'cuda')
+
+        with torch.inference_mode():
+            for idx, (X, _) in enumerate(dl):
+                X = X.to(self.model.device, non_blocking=True)
                 Yh = self._net_call(X)
-                Yh = torch.unsqueeze(Yh, 0) if len(Yh.shape) < 2 else Yh
 
                 kwargs = {}
                 for dep in self.target_encoder.dependencies:
@@ -364,7 +403,7 @@ class Neural(BaseMixer):
 
                 if args.predict_proba and self.supports_proba:
                     decoded_prediction, probs, rev_map = self.target_encoder.decode_probabilities(Yh, **kwargs)
-                    all_probs.append(probs)
+                    all_probs.extend(probs)
                 else:
                     decoded_prediction = self.target_encoder.decode(Yh, **kwargs)
 
@@ -373,7 +412,7 @@ class Neural(BaseMixer):
             ydf = pd.DataFrame({'prediction': decoded_predictions})
 
             if args.predict_proba and self.supports_proba:
-                raw_predictions = np.array(all_probs).squeeze(axis=1)
+                raw_predictions = np.array(all_probs)
 
                 for idx, label in enumerate(rev_map.values()):
                     ydf[f'__mdb_proba_{label}'] = raw_predictions[:, idx]
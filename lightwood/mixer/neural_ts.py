@@ -14,7 +14,7 @@ from type_infer.dtype import dtype
 from lightwood.api.types import PredictionArguments
 from lightwood.encoder.base import BaseEncoder
 from lightwood.data.encoded_ds import EncodedDs, ConcatedEncodedDs
-from lightwood.mixer.neural import Neural
+from lightwood.mixer.neural import Neural, _tf32_matmul
 from lightwood.mixer.helpers.ar_net import ArNet
 from lightwood.mixer.helpers.default_net import DefaultNet
 from lightwood.api.types import TimeseriesSettings
@@ -116,9 +116,11 @@ class NeuralTs(Neural):
         if self.fit_on_dev:
             self.partial_fit(dev_data, train_data)
 
+    @_tf32_matmul
     def fit(self, train_data: EncodedDs, dev_data: EncodedDs) -> None:
         self._fit(train_data, dev_data)
 
+    @_tf32_matmul
     def __call__(self, ds: EncodedDs,
                  args: PredictionArguments = PredictionArguments()
                  ) -> pd.DataFrame:
@@ -1,5 +1,4 @@
 import importlib
-from copy import deepcopy
 from datetime import datetime
 from typing import Dict, Union, Optional
 
@@ -17,6 +16,17 @@ from lightwood.mixer.base import BaseMixer
 from lightwood.api.types import PredictionArguments
 from lightwood.data.encoded_ds import EncodedDs, ConcatedEncodedDs
 
+# pandas offset aliases and their approximate duration in seconds, used to infer the series frequency
+_FREQ_LABELS = ('S', 'T', 'H', 'D', 'W', 'M', 'Q', 'Y')
+_FREQ_SECS = (1,
+              60,
+              60 * 60,
+              60 * 60 * 24,
+              60 * 60 * 24 * 7,
+              60 * 60 * 24 * 7 * 4,
+              60 * 60 * 24 * 7 * 4 * 3,
+              60 * 60 * 24 * 7 * 4 * 12)
+
 
 class SkTime(BaseMixer):
     forecaster: str
@@ -94,6 +104,7 @@ class SkTime(BaseMixer):
         # optuna hyperparameter tuning
         self.models = {}
         self.cutoffs = {}  # last seen timestamp per each model
+        self._pred_cache: Dict[Union[str, tuple], list] = {}  # longest AutoARIMA forecast so far, per group
         self.study = None
         self.hyperparam_dict = {}
         self.model_path = model_path if model_path else 'trend.STLForecaster'
@@ -108,6 +119,16 @@ class SkTime(BaseMixer):
         # the default assumption is to forecast the next `self.horizon` after said data point
         self.fh = ForecastingHorizon(np.arange(1, self.horizon + 1), is_relative=True)
 
+    def __getstate__(self):
+        # cached forecasts are a runtime optimization and should not be serialized with the predictor
+        state = self.__dict__.copy()
+        state['_pred_cache'] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_pred_cache', {})  # predictors saved before the cache existed
+
     def fit(self, train_data: EncodedDs, dev_data: EncodedDs) -> None:
         """
         Fits a set of sktime forecasters. The number of models depends on how many groups are observed at training time.
@@ -132,6 +153,7 @@ class SkTime(BaseMixer):
         Internal method that fits forecasters to a given dataframe.
         """
         df = data.data_frame.sort_values(by=f'__mdb_original_{self.ts_analysis["tss"].order_by}')
+        self._pred_cache = {}  # models are about to be refit
         gby = self.ts_analysis['tss'].group_by
 
         if not self.hyperparam_search and not self.study:
@@ -150,21 +172,27 @@ class SkTime(BaseMixer):
         except AttributeError:
             model_class = AutoARIMA  # use AutoARIMA when the provided class does not exist
 
-        grouped = df.groupby(by=gby) if gby else df.groupby(lambda x: '__default')
+        options = self.model_kwargs
+        options['suppress_warnings'] = True  # ignore warnings if possible
+        options['error_action'] = 'raise'    # avoids fit() failing silently
+
+        if self.model_path == 'fbprophet.Prophet':
+            options['freq'] = self.freq
+
+        # the class signature is the same for all groups, so valid arguments are only resolved once
+        base_kwargs = {}
+        for k, v in options.items():
+            base_kwargs = _add_cls_kwarg(model_class, base_kwargs, k, v)
+        supports_sp = 'sp' in _add_cls_kwarg(model_class, {}, 'sp', None)
+
+        grouped = df.groupby(by=gby, sort=False, observed=True) if gby else [('__default', df)]
         for group, series_data in grouped:
-            kwargs = {}
             sp = self.sp if self.sp else self.ts_analysis['periods'].get(group, [1])[0]
-
-            options = self.model_kwargs
             options['sp'] = sp               # seasonality period
-            options['suppress_warnings'] = True  # ignore warnings if possible
-            options['error_action'] = 'raise'    # avoids fit() failing silently
-
-            if self.model_path == 'fbprophet.Prophet':
-                options['freq'] = self.freq
 
-            for k, v in options.items():
-                kwargs = _add_cls_kwarg(model_class, kwargs, k, v)
+            kwargs = dict(base_kwargs)
+            if supports_sp:
+                kwargs['sp'] = sp
 
             model_pipeline = []
 
@@ -190,7 +218,9 @@ class SkTime(BaseMixer):
             if series_data.size > self.ts_analysis['tss'].window:
                 series = series.sort_index(ascending=True)
                 series = series.reset_index(drop=True)
-                series = series.loc[~pd.isnull(series.values)]  # remove NaN  # @TODO: benchmark imputation vs this?
+                # remove missing values (NaN, None, pd.NA) and ±inf  # @TODO: benchmark imputation vs this?
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+                series = pd.Series(values, index=series.index)[np.isfinite(values)]
 
                 if self.model_path == 'fbprophet.Prophet':
                     try:
@@ -200,8 +230,6 @@ class SkTime(BaseMixer):
                             # out of bounds with true freq in __default group is fine, we skip it
                             continue
 
-                series = series.astype(float)
-
                 # if data is huge, filter out old records for quicker fitting
                 if self.auto_size:
                     cutoff = min(len(series), max(500, options.get('sp', 1) * self.cutoff_factor))
@@ -239,8 +267,7 @@ class SkTime(BaseMixer):
         if args.predict_proba:
             log.warning('This mixer does not output probability estimates')
 
-        df = deepcopy(ds.data_frame)
-        df = df.rename_axis('__sktime_index').reset_index()
+        df = ds.data_frame.rename_axis('__sktime_index').reset_index()  # reset_index already returns a new frame
 
         gby = self.ts_analysis['tss'].group_by
         ydf = pd.DataFrame(0,  # zero-filled
@@ -248,28 +275,28 @@ class SkTime(BaseMixer):
                            columns=['prediction'],
                            dtype=object)
 
-        pending_idxs = set(df.index)
-        grouped = df.groupby(by=gby) if gby else df.groupby(lambda x: '__default')
+        pending_mask = np.ones(len(df), dtype=bool)  # df has a RangeIndex, so labels are also positions
+        grouped = df.groupby(by=gby, sort=False, observed=True) if gby else [('__default', df)]
         for group, series_data in grouped:
-            if series_data.size > 0:
-                start_ts = series_data['__sktime_index'].iloc[0]
-                series = series_data[self.target]
-                series_idxs = series.index
-                if self.models.get(group, False) and self.models[group].is_fitted:
-                    freq = self.ts_analysis['deltas'][group]
-                    delta = (start_ts - self.cutoffs[group]).total_seconds()
-                    offset = round(delta / freq)
-                    forecaster = self.models[group]
-                    ydf = self._call_groupmodel(ydf, forecaster, series, offset=offset)
-                else:
-                    log.warning(f"Applying naive forecaster for novel group {group}. Performance might not be optimal.")
-                    ydf = self._call_default(ydf, series.values, series_idxs)
-                pending_idxs -= set(series_idxs)
+            start_ts = series_data['__sktime_index'].iloc[0]
+            series = series_data[self.target]
+            series_idxs = series.index
+            if self.models.get(group, False) and self.models[group].is_fitted:
+                freq = self.ts_analysis['deltas'][group]
+                delta = (start_ts - self.cutoffs[group]).total_seconds()
+                offset = round(delta / freq)
+                forecaster = self.models[group]
+                ydf = self._call_groupmodel(ydf, forecaster, series, group, offset=offset)
+            else:
+                log.warning(f"Applying naive forecaster for novel group {group}. Performance might not be optimal.")
+                ydf = self._call_default(ydf, series.values, series_idxs)
+            pending_mask[series_idxs.to_numpy()] = False
 
         # apply default model in all remaining novel-group rows
-        if len(pending_idxs) > 0:
-            series = df[self.target][list(pending_idxs)].squeeze()
-            ydf = self._call_default(ydf, series, list(pending_idxs))
+        if pending_mask.any():
+            novel_idxs = df.index[pending_mask]
+            series = df[self.target].loc[novel_idxs]
+            ydf = self._call_default(ydf, series.values, novel_idxs)
 
         return ydf[['prediction']]
 
@@ -277,10 +304,12 @@ class SkTime(BaseMixer):
                          ydf: pd.DataFrame,
                          model: BaseForecaster,
                          series: pd.Series,
+                         group: Union[str, tuple],
                          offset: int = 0):
         """
         Inner method that calls a `sktime.BaseForecaster`.
 
+        :param group: group the forecaster was fit on, used to cache its forecasts.
         :param offset: indicates relative offset to the latest data point seen during model training. Cannot be less than the number of training data points + the amount of diffences applied internally by the model.
         """  # noqa
         if isinstance(model, TransformedTargetForecaster):
@@ -298,21 +327,24 @@ class SkTime(BaseMixer):
 
         # Workaround for StatsForecastAutoARIMA (see sktime#3600)
         if isinstance(submodel, AutoARIMA):
-            all_preds = model.predict(np.arange(min_offset, end)).tolist()[-(end - start):]
+            cached_preds = self._pred_cache.get(group, [])
+            if len(cached_preds) < end - min_offset:
+                cached_preds = model.predict(np.arange(min_offset, end)).tolist()
+                self._pred_cache[group] = cached_preds
+            all_preds = cached_preds[:end - min_offset][-(end - start):]
         else:
             all_preds = model.predict(np.arange(start, end)).tolist()
 
-        for true_idx, (idx, _) in enumerate(series.items()):
-            start_idx = max(0, true_idx)
-            end_idx = start_idx + self.horizon
-            ydf['prediction'].loc[idx] = all_preds[start_idx:end_idx]
+        preds = [all_preds[i:i + self.horizon] for i in range(series.shape[0])]
+        ydf.loc[series.index, 'prediction'] = pd.Series(preds, index=series.index, dtype=object)
         return ydf
 
     def _call_default(self, ydf, data, idxs):
         # last value from each window equals shifted target (by 1)  # noqa
-        series = np.array([0] + list(data.flatten())[:-1])
-        all_preds = [[value for _ in range(self.horizon)] for value in series]
-        ydf['prediction'].iloc[idxs] = all_preds
+        values = np.asarray(data).flatten()
+        series = np.concatenate([[0], values[:-1]])
+        all_preds = np.repeat(series[:, None], self.horizon, axis=1).tolist()
+        ydf.loc[idxs, 'prediction'] = pd.Series(all_preds, index=idxs, dtype=object)
         return ydf
 
     def _get_best_model(self, trial, train_data, test_data):
@@ -338,20 +370,10 @@ class SkTime(BaseMixer):
         return error
 
     def _transform_index_to_datetime(self, series, series_oby, freq):
-        series_oby = np.array([np.array(lst) for lst in series_oby])
-        start = datetime.utcfromtimestamp(np.min(series_oby[series_oby != np.min(series_oby)]))
+        series_oby = np.array(series_oby.tolist(), dtype=np.float64)  # rows may be windows (lists) of timestamps
+        start = datetime.utcfromtimestamp(series_oby[series_oby != series_oby.min()].min())
         series.index = pd.date_range(start=start, freq=freq, normalize=False, periods=series.shape[0])
         return series
 
     def _get_freq(self, delta):
-        labels = ['S', 'T', 'H', 'D', 'W', 'M', 'Q', 'Y']
-        secs = [1,
-                60,
-                60 * 60,
-                60 * 60 * 24,
-                60 * 60 * 24 * 7,
-                60 * 60 * 24 * 7 * 4,
-                60 * 60 * 24 * 7 * 4 * 3,
-                60 * 60 * 24 * 7 * 4 * 12]
-        min_diff = np.argmin(np.abs(np.array(secs) - delta))
-        return labels[min_diff]
+        return _FREQ_LABELS[min(range(len(_FREQ_SECS)), key=lambda i: abs(_FREQ_SECS[i] - delta))]
@@ -6,7 +6,7 @@ from tab_transformer_pytorch import TabTransformer
 from lightwood.helpers.device import get_device_from_name
 from lightwood.data.encoded_ds import EncodedDs
 from lightwood.encoder.base import BaseEncoder
-from lightwood.mixer.neural import Neural
+from lightwood.mixer.neural import Neural, _tf32_matmul
 
 
 class TabTransformerMixer(Neural):
@@ -60,6 +60,7 @@ class TabTransformerMixer(Neural):
         x = torch.unsqueeze(x, 0) if len(x.shape) < 2 else x
         return self.model(torch.Tensor(), x)
 
+    @_tf32_matmul
     def fit(self, train_data: EncodedDs, dev_data: EncodedDs) -> None:
         """ Skip the usual partial_fit call at the end. """  # noqa
         self._fit(train_data, dev_data)
@@ -2,6 +2,7 @@ import unittest
 import numpy as np
 import pandas as pd
 from lightwood.api.types import ProblemDefinition
+from lightwood.data.encoded_ds import ConcatedEncodedDs
 from lightwood.api.high_level import json_ai_from_problem, code_from_json_ai, predictor_from_code, predictor_from_problem  # noqa
 
 np.random.seed(0)
@@ -37,3 +38,23 @@ class TestArrayTarget(unittest.TestCase):
         df['input'] = [[chr(65 + i + row % 4) for i in range(arr_len)] for row in range(200)]
         df['output'] = [[chr(65 + i + row % 4) for i in range(arr_len)][::-1] for row in range(200)]
         self._test_array(df)
+
+    def test_2_cat_array_batched_neural(self):
+        """ Tests that batched Neural inference emits one prediction per input row for categorical array targets. """
+        df = pd.DataFrame()
+        arr_len = 4
+        df['input'] = [[chr(65 + i + row % 4) for i in range(arr_len)] for row in range(600)]
+        df['output'] = [[chr(65 + i + row % 4) for i in range(arr_len)][::-1] for row in range(600)]
+
+        jai = json_ai_from_problem(df, ProblemDefinition.from_dict({'target': 'output', 'time_aim': 80}))
+        jai.model['args']['submodels'] = [{'module': 'Neural', 'args': {}}]
+        predictor = predictor_from_code(code_from_json_ai(jai))
+        predictor.learn(df)
+
+        test = predictor.preprocess(df.iloc[:300])
+        ds = predictor.featurize({'predict_data': test})['predict_data']
+        preds = predictor.mixers[0](ds)  # 300 rows span more than one inference batch
+        self.assertEqual(len(preds), len(ds))
+
+        concat_preds = predictor.mixers[0](ConcatedEncodedDs([ds]))
+        self.assertEqual(len(concat_preds), len(ds))